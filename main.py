@@ -1,17 +1,47 @@
 # Standard library imports
-import time
 import sqlite3
 import smtplib
 import os
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from email.mime.text import MIMEText
+from functools import partial
 
 # Third-party imports
 import requests
 from dotenv import load_dotenv
 
+# Optional: orjson parses the multi-MB listing payloads 2-3x faster than
+# the stdlib decoder; fall back to json if it isn't installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+    _json_dumps = orjson.dumps
+except ImportError:
+    import json
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+# Optional: ijson streams the large listing arrays item by item so the
+# multi-MB payloads are never materialized as full Python lists; fall
+# back to a full parse if it isn't installed
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Optional: a Bloom filter in front of the seen table answers "definitely
+# unseen" in O(1) bounded memory, so the full id history never has to be
+# loaded into RAM as it grows; fall back to the per-cycle set load
+try:
+    from pybloom_live import ScalableBloomFilter
+except ImportError:
+    ScalableBloomFilter = None
+
 # Load variables from .env file
-load_dotenv()  
+load_dotenv()
 
 # Email configuration
 FROM_EMAIL = os.getenv("FROM_EMAIL")          # Gmail address for sending alerts
@@ -21,6 +51,38 @@ TO_EMAIL = os.getenv("TO_EMAIL")              # Recipient email address
 # Monitoring configuration
 CHECK_INTERVAL_MINUTES = 30  # How often to check for new jobs (in minutes)
 DB = "seen.db"               # SQLite database file to track seen jobs
+BLOOM_FILE = "seen.bloom"    # Persisted Bloom filter kept alongside the DB
+
+# Bound once at module scope; cheaper than the attribute lookup per listing
+_from_ts = datetime.fromtimestamp
+
+# Set by the signal handler; waiting on it instead of time.sleep lets a
+# shutdown signal interrupt the 30-minute nap immediately
+STOP_EVENT = threading.Event()
+
+# Shared HTTP session so repeated fetches reuse TCP/TLS connections
+SESSION = requests.Session()
+
+# Notion configuration - resolved once at import time instead of per call
+NOTION_URL = "https://api.notion.com/v1/pages"  # Endpoint for creating pages
+NOTION_DB_ID = os.getenv("NOTION_DB_ID")        # Target Notion database
+NOTION_HEADERS = {
+    "Authorization": f"Bearer {os.getenv('NOTION_TOKEN')}",
+    "Content-Type": "application/json",
+    "Notion-Version": "2022-06-28"
+}
+
+# Dedicated session for Notion so every page creation reuses one
+# TLS connection instead of handshaking per listing
+NOTION_SESSION = requests.Session()
+NOTION_SESSION.headers.update(NOTION_HEADERS)
+
+# Conditional-GET cache: url -> (etag, last_modified, recent_listings)
+# Lets the server answer 304 Not Modified so unchanged multi-MB payloads
+# are neither re-downloaded nor re-parsed; the watermark-filtered result
+# of the previous parse (a handful of listings) is kept so a 304 still
+# yields the listings a failed cycle needs to retry
+URL_CACHE = {}
 
 # GitHub repository JSON endpoints containing job listings
 JSON_URLS = [
@@ -32,78 +94,209 @@ JSON_URLS = [
 conn = sqlite3.connect(DB)
 cur = conn.cursor()
 
+# Tune SQLite for this write-light workload:
+# WAL + relaxed sync avoid an fsync per commit, temp tables and a larger
+# page cache stay in memory
+cur.execute("PRAGMA journal_mode=WAL")
+cur.execute("PRAGMA synchronous=NORMAL")
+cur.execute("PRAGMA temp_store=MEMORY")
+cur.execute("PRAGMA cache_size=-20000")
+
 # Create table to store unique IDs of jobs that have already been processed
 # This prevents sending duplicate notifications for the same job
-cur.execute("CREATE TABLE IF NOT EXISTS seen (id TEXT PRIMARY KEY)")
+# WITHOUT ROWID keeps a single B-tree keyed by id instead of a rowid table
+# plus a separate primary-key index - smaller file, faster lookups
+cur.execute("CREATE TABLE IF NOT EXISTS seen (id TEXT PRIMARY KEY) WITHOUT ROWID")
+
+# One-time migration for databases created before WITHOUT ROWID was used
+row = cur.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name='seen'").fetchone()
+if row and "WITHOUT ROWID" not in row[0]:
+    cur.execute("CREATE TABLE seen_new (id TEXT PRIMARY KEY) WITHOUT ROWID")
+    cur.execute("INSERT INTO seen_new SELECT id FROM seen")
+    cur.execute("DROP TABLE seen")
+    cur.execute("ALTER TABLE seen_new RENAME TO seen")
+
+# Small key/value table for cycle state; holds 'last_ts', the newest
+# date_posted we have processed, so old listings can be skipped outright
+cur.execute("CREATE TABLE IF NOT EXISTS meta (k TEXT PRIMARY KEY, v INTEGER) WITHOUT ROWID")
+
 conn.commit()
 
+# Load the persisted Bloom filter, or rebuild it from the seen table
+# Acts as an L1 in front of SQLite: a miss means definitely unseen, a hit
+# is confirmed with a point SELECT to rule out false positives
+SEEN_BLOOM = None
+if ScalableBloomFilter is not None:
+    try:
+        with open(BLOOM_FILE, "rb") as f:
+            SEEN_BLOOM = ScalableBloomFilter.fromfile(f)
+    except (OSError, ValueError):
+        SEEN_BLOOM = ScalableBloomFilter(initial_capacity=100000, error_rate=0.001)
+        for row in cur.execute("SELECT id FROM seen"):
+            SEEN_BLOOM.add(row[0])
+
 
 
 def get_unique_id(listing: dict) -> str:
     """
     Get the unique identifier for a job listing from the repository data.
-    
+
     Args:
         listing (dict): Job listing data from JSON API
-        
+
     Returns:
         str: Repository-provided unique identifier or None if missing
-        
+
     Uses the 'id' field provided by the repository, which is a UUID that
     remains stable even if job details change.
     """
 
     # Use the repository-provided ID field
     repo_id = listing.get('id')
-    
+
     # Validate that ID is present and not empty
-    if not repo_id or not isinstance(repo_id, str) or repo_id.strip() == "":
+    # Strip once - this runs for every listing every cycle
+    if not repo_id or not isinstance(repo_id, str):
         return None
-    
-    return repo_id.strip()
 
+    return repo_id.strip() or None
 
 
-def fetch_listings() -> list:
+
+def _fetch_one(url: str, last_ts: int = 0) -> list:
+    """
+    Fetch job listings newer than the watermark from a single JSON endpoint.
+
+    Args:
+        url (str): JSON endpoint URL to fetch
+        last_ts (int): date_posted watermark; listings at or below it are
+            dropped during parsing (undated listings are always kept)
+
+    Returns:
+        list: Recent job listings, or None if the request fails - callers
+        must be able to tell a failed source apart from "nothing new" so
+        the watermark is held back and its listings retried
+
+    Sends If-None-Match/If-Modified-Since validators from the previous
+    response; on 304 Not Modified nothing is downloaded or parsed and the
+    previous (already filtered) result is reused - listings held back by
+    a failed cycle are still returned for retry. When ijson is available
+    the response is streamed and filtered item by item, so the multi-MB
+    array is never held in memory at once.
+    """
+
+    # Build conditional-GET headers from the previous response, if any
+    etag, last_modified, cached = URL_CACHE.get(url, (None, None, None))
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    try:
+        # Make HTTP GET request to fetch JSON data
+        resp = SESSION.get(url, headers=headers, stream=True)
+
+        # Source unchanged since last fetch - reuse the previous filtered
+        # result so listings awaiting a retry are not starved until the
+        # upstream file changes
+        if resp.status_code == 304:
+            return cached if cached is not None else []
+
+        resp.raise_for_status()  # Raise exception for bad status codes
+
+        if ijson is not None:
+            # Stream the array and keep only listings newer than the
+            # watermark - peak memory is the handful of recent listings
+            # use_float matches the orjson/stdlib path: without it ijson
+            # yields JSON floats as Decimal, which neither sqlite3 nor
+            # datetime.fromtimestamp accepts
+            resp.raw.decode_content = True
+            recent = []
+            for l in ijson.items(resp.raw, 'item', use_float=True):
+                ts = l.get('date_posted') or 0
+                if last_ts and ts and ts <= last_ts:
+                    continue
+                recent.append(l)
+        else:
+            # Fallback: parse the full payload, then filter by the watermark
+            listings = _json_loads(resp.content)
+            if last_ts:
+                recent = [l for l in listings if not l.get('date_posted') or l['date_posted'] > last_ts]
+            else:
+                recent = listings
+
+        # Remember validators and the filtered result for the next cycle
+        URL_CACHE[url] = (resp.headers.get("ETag"), resp.headers.get("Last-Modified"), recent)
+        return recent
+
+    except requests.exceptions.RequestException as e:
+        print(f"Error fetching from {url}: {e}")
+        return None
+
+
+
+def fetch_listings(last_ts: int = 0) -> tuple:
     """
     Fetch job listings from all configured GitHub repository JSON endpoints.
-    
+
+    Args:
+        last_ts (int): date_posted watermark passed through to each fetch
+
     Returns:
-        list: Combined list of all job listings from all repositories
-        
-    Raises:
-        requests.exceptions.RequestException: If any HTTP request fails
+        tuple: (listings, all_ok) - the combined recent job listings from
+        all repositories, and False if any source failed to fetch so the
+        caller knows not to advance the watermark past listings it may
+        have missed
+
+    The endpoints are independent, so they are fetched concurrently with a
+    thread pool - total latency is the slowest request instead of the sum.
     """
 
     results = []
-    
-    # Iterate through each configured JSON URL
-    for url in JSON_URLS:
-        try:
-            # Make HTTP GET request to fetch JSON data
-            resp = requests.get(url)
-            resp.raise_for_status()  # Raise exception for bad status codes
-            
-            # Parse JSON and extend results list
-            results.extend(resp.json())
-            time.sleep(2)
-            
-        except requests.exceptions.RequestException as e:
-            print(f"Error fetching from {url}: {e}")
-            continue
-    
-    return results
-
-
-
-def send_email(subject: str, body: str):
-    """
-    Send email notification using Gmail SMTP.
-    
+    all_ok = True
+
+    # Fetch all configured JSON URLs in parallel
+    with ThreadPoolExecutor(max_workers=len(JSON_URLS)) as executor:
+        for listings in executor.map(partial(_fetch_one, last_ts=last_ts), JSON_URLS):
+            if listings is None:
+                all_ok = False
+                continue
+            results.extend(listings)
+
+    return results, all_ok
+
+
+
+def open_smtp() -> smtplib.SMTP_SSL:
+    """
+    Open an authenticated SMTP connection to Gmail.
+
+    Returns:
+        smtplib.SMTP_SSL: Logged-in connection, ready for send_message
+
+    Raises:
+        smtplib.SMTPException: If connecting or logging in fails
+
+    Opened once per cycle so a burst of notifications shares a single
+    TLS handshake and login instead of paying both per email.
+    """
+
+    server = smtplib.SMTP_SSL('smtp.gmail.com', 465)
+    server.login(FROM_EMAIL, EMAIL_PASSWORD)
+    return server
+
+
+
+def send_email(server: smtplib.SMTP_SSL, subject: str, body: str):
+    """
+    Send email notification over an already-open SMTP connection.
+
     Args:
+        server (smtplib.SMTP_SSL): Authenticated connection from open_smtp
         subject (str): Email subject line
         body (str): Email body content
-        
+
     Raises:
         smtplib.SMTPException: If email sending fails
     """
@@ -114,71 +307,106 @@ def send_email(subject: str, body: str):
     msg['From'] = FROM_EMAIL
     msg['To'] = TO_EMAIL
 
-    # Send email using Gmail's SMTP server with SSL
-    with smtplib.SMTP_SSL('smtp.gmail.com', 465) as server:
-        server.login(FROM_EMAIL, EMAIL_PASSWORD)
-        server.send_message(msg)
+    # Send over the shared connection
+    server.send_message(msg)
 
 
 
-def add_to_notion(listing):
+def _term_str(listing: dict) -> str:
     """
-    Add a job listing to Notion database for tracking and organization.
-    
+    Extract term/season information from a listing.
+
     Args:
-        listing (dict): Job listing data to add to Notion
-        
-    The function creates a new page in the Notion database with structured
-    properties for easy filtering and searching.
+        listing (dict): Job listing data
+
+    Returns:
+        str: Human-readable term string, or "N/A" if absent
+
+    Handles both repository formats: vanshb03 uses "season": "Fall",
+    SimplifyJobs uses "terms": ["Summer 2024"].
     """
 
-    # Notion API endpoint for creating new pages
-    url = "https://api.notion.com/v1/pages"
+    terms = listing.get('terms')
+    if terms and isinstance(terms, list):
+        return ", ".join(terms)
+    return listing.get('season') or "N/A"
 
-    # Set up authentication and headers for Notion API
-    headers = {
-        "Authorization": f"Bearer {os.getenv('NOTION_TOKEN')}",
-        "Content-Type": "application/json",
-        "Notion-Version": "2022-06-28"
-    }
 
-    # Process location data (convert list to comma-separated string)
+
+def _location_str(listing: dict) -> str:
+    """
+    Combine a listing's locations into a single display string.
+
+    Args:
+        listing (dict): Job listing data
+
+    Returns:
+        str: Locations joined with "; ", or "N/A" if absent
+    """
+
     locations = listing.get('locations')
-    location_str = "; ".join(locations) if locations and isinstance(locations, list) else "N/A"
+    return "; ".join(locations) if locations and isinstance(locations, list) else "N/A"
+
+
+
+def _rich_text(content: str) -> dict:
+    """
+    Build a Notion rich_text property value for a plain string.
+
+    Args:
+        content (str): Text to wrap
+
+    Returns:
+        dict: Property value in Notion's rich_text shape
+    """
+
+    return {"rich_text": [{"text": {"content": content}}]}
+
+
+
+def add_to_notion(listing, term_str: str = None, location_str: str = None):
+    """
+    Add a job listing to Notion database for tracking and organization.
+
+    Args:
+        listing (dict): Job listing data to add to Notion
+        term_str (str): Pre-computed term string; derived if not given
+        location_str (str): Pre-computed location string; derived if not given
+
+    The function creates a new page in the Notion database with structured
+    properties for easy filtering and searching. Callers that already
+    formatted the term/location strings pass them in so the work happens
+    once per listing.
+    """
+
+    # Derive the display strings only when the caller did not pass them
+    if term_str is None:
+        term_str = _term_str(listing)
+    if location_str is None:
+        location_str = _location_str(listing)
 
     # Convert Unix timestamp to ISO format for Notion date field
     date_posted_ts = listing.get('date_posted')
-    date_posted_iso = datetime.fromtimestamp(date_posted_ts).isoformat() if date_posted_ts else None
-
-    # Process term/season information - handle both repository formats
-    # vanshb03 uses "season": "Fall", SimplifyJobs uses "terms": ["Summer 2024"]
-    terms = listing.get('terms', [])
-    season = listing.get('season')
-    
-    if terms and isinstance(terms, list):
-        # SimplifyJobs format: ["Summer 2024"]
-        term_str = ", ".join(terms)
-    elif season:
-        # vanshb03 format: "Fall"
-        term_str = season
-    else:
-        term_str = "N/A"
+    date_posted_iso = _from_ts(date_posted_ts).isoformat() if date_posted_ts else None
 
     # Structure the data according to Notion's page creation format
     data = {
-        "parent": {"database_id": os.getenv('NOTION_DB_ID')},
+        "parent": {"database_id": NOTION_DB_ID},
         "properties": {
             "Company": {"title": [{"text": {"content": listing.get('company_name', 'N/A')}}]},
-            "Title": {"rich_text": [{"text": {"content": listing.get('title', 'N/A')}}]},
-            "Term": {"rich_text": [{"text": {"content": term_str}}]},
-            "Location(s)": {"rich_text": [{"text": {"content": location_str}}]},
+            "Title": _rich_text(listing.get('title', 'N/A')),
+            "Term": _rich_text(term_str),
+            "Location(s)": _rich_text(location_str),
             "Date Posted": {"date": {"start": date_posted_iso}},
-            "Sponsorship": {"rich_text": [{"text": {"content": listing.get('sponsorship', 'N/A')}}]}
+            "Sponsorship": _rich_text(listing.get('sponsorship', 'N/A'))
         }
     }
 
-    # Make API request to create the new page
-    response = requests.post(url, headers=headers, json=data)
+    # Make API request to create the new page over the shared session
+    # Serialize the body ourselves (orjson when available) instead of
+    # letting requests run the stdlib encoder; the session's Content-Type
+    # header already says application/json
+    response = NOTION_SESSION.post(NOTION_URL, data=_json_dumps(data))
 
     # Log the result
     if response.status_code == 200 or response.status_code == 201:
@@ -188,10 +416,123 @@ def add_to_notion(listing):
 
 
 
+def _process_listing(server: smtplib.SMTP_SSL, smtp_lock: threading.Lock, uid: str, l: dict):
+    """
+    Format and send all notifications for one new listing.
+
+    Args:
+        server (smtplib.SMTP_SSL): Shared authenticated SMTP connection
+        smtp_lock (threading.Lock): Serializes sends on the shared connection
+        uid (str): Unique identifier of the listing
+        l (dict): Job listing data
+
+    Raises:
+        Exception: Propagated from email or Notion failures so the caller
+        can decide whether to mark the listing as seen
+
+    Runs on a worker thread; everything here is safe off the main thread
+    (the SQLite connection is not touched).
+    """
+
+    # Bind repeated fields to locals once - each l.get() below is a
+    # dict lookup and these are reused several times per listing
+    company = l.get('company_name', 'N/A')
+    title = l.get('title', 'N/A')
+    apply_url = l.get('url', 'N/A')
+
+    # Format shared display strings once; they feed both the email body
+    # and the Notion payload below
+    term_str = _term_str(l)
+    location_str = _location_str(l)
+
+    # Convert timestamp to readable date
+    date_posted_ts = l.get('date_posted')
+    if date_posted_ts:
+        date_posted = _from_ts(date_posted_ts).strftime("%b %d, %Y")
+    else:
+        date_posted = "N/A"
+
+    # Extract sponsorship information
+    sponsorship = l.get('sponsorship', 'N/A')
+
+    # Create email subject line
+    subject = f"🎉 New Internship Alert: {company} - {title}"
+
+    # Create detailed email body with all job information
+    body = (
+        f"Reeled in a new internship for you! 🎣\n\n"
+        f"🏢 Company: {company}\n"
+        f"💼 Title: {title}\n"
+        f"📅 Term: {term_str}\n"
+        f"📍 Location(s): {location_str}\n"
+        f"🗓 Date Posted: {date_posted}\n"
+        f"🎫 Sponsorship: {sponsorship}\n"
+        f"🔗 Apply here: {apply_url}\n\n"
+        f"Remember to swim fast, the best opportunities don't wait!\n"
+        f"Opportuna 🐟"
+    )
+
+    # Send email notification over the shared connection
+    with smtp_lock:
+        send_email(server, subject, body)
+    print(f"Email sent for: {company} - {title}")
+
+    # Add to Notion database, reusing the strings formatted above
+    add_to_notion(l, term_str=term_str, location_str=location_str)
+
+    print(f"Job tracked: {company} - {title}")
+
+
+
+def _bloom_is_seen(uid: str) -> bool:
+    """
+    Check whether a uid has been seen, using the Bloom filter as L1.
+
+    Args:
+        uid (str): Unique identifier of the listing
+
+    Returns:
+        bool: True if the uid is recorded in the seen table
+
+    A Bloom miss is definitely unseen and skips SQLite entirely; a hit
+    may be a false positive, so it is confirmed with a point SELECT.
+    """
+
+    if uid not in SEEN_BLOOM:
+        return False
+    return cur.execute("SELECT 1 FROM seen WHERE id=?", (uid,)).fetchone() is not None
+
+
+
+def _save_bloom():
+    """
+    Persist the Bloom filter so restarts skip the rebuild scan.
+    """
+
+    if SEEN_BLOOM is None:
+        return
+    with open(BLOOM_FILE, "wb") as f:
+        SEEN_BLOOM.tofile(f)
+
+
+
+def _save_last_ts(ts: int):
+    """
+    Persist the newest processed date_posted timestamp.
+
+    Args:
+        ts (int): Watermark value to store in the meta table
+    """
+
+    cur.execute("INSERT OR REPLACE INTO meta(k, v) VALUES ('last_ts', ?)", (ts,))
+    conn.commit()
+
+
+
 def check_for_new_jobs():
     """
     Checks for new job listings and processes them.
-    
+
     This function:
     1. Fetches all current job listings from configured sources
     2. Checks each listing against the database of previously seen jobs
@@ -199,92 +540,153 @@ def check_for_new_jobs():
     4. Updates the database to mark the job as seen
     """
 
-    # Fetch all current job listings
-    listings = fetch_listings()
-    print(f"Checking {len(listings)} listings for new jobs...")
-
-    # Process each job listing
+    # Newest date_posted processed so far - anything at or before this
+    # watermark was covered by an earlier cycle and is filtered out while
+    # the payloads are parsed
+    row = cur.execute("SELECT v FROM meta WHERE k='last_ts'").fetchone()
+    last_ts = row[0] if row else 0
+    max_ts = last_ts
+
+    # Fetch the job listings newer than the watermark
+    # A failed source holds the watermark back below, otherwise its
+    # listings would be aged out before they were ever notified
+    listings, fetch_ok = fetch_listings(last_ts)
+
+    if SEEN_BLOOM is not None:
+        # Bloom filter fast path - memory stays bounded no matter how
+        # large the seen history grows
+        is_seen = _bloom_is_seen
+    else:
+        # Load all previously seen IDs into memory once per cycle
+        # A single SELECT beats thousands of per-listing round-trips to SQLite
+        seen_ids = {row[0] for row in cur.execute("SELECT id FROM seen")}
+        is_seen = seen_ids.__contains__
+
+    # Deduplicate by uid - the two sources often carry the same internships,
+    # so keep a single instance and drop invalid listings in the same pass
+    unique = {}
     for l in listings:
-        # Generate unique identifier for this job
+        ts = l.get('date_posted') or 0
+        if ts > max_ts:
+            max_ts = ts
         uid = get_unique_id(l)
+        if uid and uid not in unique:
+            unique[uid] = l
+
+    # Pass 1: cheap uid check only - skip already-seen listings
+    # before doing any of the expensive formatting work below
+    new_listings = [(uid, l) for uid, l in unique.items() if not is_seen(uid)]
+    print(f"Checked {len(listings)} listings ({len(unique)} unique): {len(new_listings)} new")
+
+    # Nothing new this cycle - advance the watermark (fetches permitting)
+    # and skip opening the SMTP connection entirely
+    if not new_listings:
+        if fetch_ok:
+            _save_last_ts(max_ts)
+        return
+
+    # One SMTP connection and login for the whole batch; smtplib
+    # connections are not thread-safe, so sends are serialized with a lock
+    # Opened before any claims are recorded: if connecting or logging in
+    # fails, nothing has been marked seen yet and the whole batch is
+    # simply retried next cycle
+    server = open_smtp()
+    smtp_lock = threading.Lock()
+
+    # Claim each candidate atomically up front: INSERT OR IGNORE sets
+    # rowcount only when this process actually inserted the row, replacing
+    # the racy SELECT-then-INSERT dance with one statement
+    # The in-memory set above remains the fast path that keeps known-seen
+    # listings away from SQLite entirely
+    claimed = []
+    for uid, l in new_listings:
+        cur.execute("INSERT OR IGNORE INTO seen(id) VALUES (?)", (uid,))
+        if cur.rowcount:
+            if SEEN_BLOOM is not None:
+                SEEN_BLOOM.add(uid)
+            claimed.append((uid, l))
+    conn.commit()
+
+    # Everything was already claimed (e.g. by a run that crashed after
+    # committing) - nothing left to notify
+    if not claimed:
+        if fetch_ok:
+            _save_last_ts(max_ts)
+        server.quit()
+        return
+
+    # Collect IDs of failed notifications; their claims are released at
+    # the end of the cycle so they are retried next time
+    failed_uids = []
+
+    # Only advance the watermark on a clean cycle, so a listing whose
+    # notification failed is retried next time instead of aged out
+    had_errors = False
+
+    try:
+        # Pass 2: notify the new listings on a small worker pool so email
+        # and Notion I/O for different listings overlap
+        # The bound stays low to keep within Notion's rate limits
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            futures = {
+                executor.submit(_process_listing, server, smtp_lock, uid, l): uid
+                for uid, l in claimed
+            }
+
+            # Collect results as they complete; the SQLite writes stay on
+            # this thread since the connection is bound to it
+            for future in as_completed(futures):
+                uid = futures[future]
+                try:
+                    future.result()
+
+                except Exception as e:
+                    had_errors = True
+                    failed_uids.append(uid)
+                    print(f"Error processing job {uid}: {e}")
+
+    finally:
+        # Release the claims of failed notifications with one batched
+        # delete and commit so those listings are retried next cycle
+        if failed_uids:
+            cur.executemany("DELETE FROM seen WHERE id=?", [(u,) for u in failed_uids])
+            conn.commit()
+
+        if not had_errors and fetch_ok:
+            _save_last_ts(max_ts)
+
+        # Keep the on-disk Bloom filter in step with the claims above
+        # (uids of failed notifications stay in the filter; their next
+        # check falls through to SQLite and finds the released claim)
+        _save_bloom()
+
+        # Always close the SMTP connection
+        server.quit()
+
+
+
+def _handle_shutdown(signum, frame):
+    """
+    Signal handler for SIGTERM/SIGINT - requests a graceful shutdown.
 
-        # Skip listings with invalid/incomplete data
-        if not uid:
-            continue
-
-        # Check if the job has already been seen
-        cur.execute("SELECT 1 FROM seen WHERE id=?", (uid,))
-        if not cur.fetchone():
-            # Combine all locations into a comma-separated string
-            locations = l.get('locations')
-            location_str = "; ".join(locations) if locations and isinstance(locations, list) else "N/A"
-
-            # Convert timestamp to readable date
-            date_posted_ts = l.get('date_posted')
-            if date_posted_ts:
-                date_posted = datetime.fromtimestamp(date_posted_ts).strftime("%b %d, %Y")
-            else:
-                date_posted = "N/A"
-
-            # Extract sponsorship information
-            sponsorship = l.get('sponsorship', 'N/A')
-
-            # Extract term/season information - handle both repository formats
-            # vanshb03 uses "season": "Fall", SimplifyJobs uses "terms": ["Summer 2024"]
-            terms = l.get('terms', [])
-            season = l.get('season')
-            
-            if terms and isinstance(terms, list):
-                # SimplifyJobs format: ["Summer 2024"]
-                term_str = ", ".join(terms)
-            elif season:
-                # vanshb03 format: "Fall"
-                term_str = season
-            else:
-                term_str = "N/A"
-
-            # Create email subject line
-            subject = f"🎉 New Internship Alert: {l.get('company_name', 'N/A')} - {l.get('title', 'N/A')}"
-
-            # Create detailed email body with all job information
-            body = (
-                f"Reeled in a new internship for you! 🎣\n\n"
-                f"🏢 Company: {l.get('company_name', 'N/A')}\n"
-                f"💼 Title: {l.get('title', 'N/A')}\n"
-                f"📅 Term: {term_str}\n"
-                f"📍 Location(s): {location_str}\n"
-                f"🗓 Date Posted: {date_posted}\n"
-                f"🎫 Sponsorship: {sponsorship}\n"
-                f"🔗 Apply here: {l.get('url', 'N/A')}\n\n"
-                f"Remember to swim fast, the best opportunities don't wait!\n"
-                f"Opportuna 🐟"
-            )
-
-            try:
-                # Send email notification
-                send_email(subject, body)
-                print(f"Email sent for: {l.get('company_name')} - {l.get('title')}")
-                
-                # Add to Notion database
-                add_to_notion(l)
-
-                print(f"Job tracked: {l.get('company_name')} - {l.get('title')}")
-                
-                # Mark as seen in local database to prevent future duplicates
-                cur.execute("INSERT INTO seen(id) VALUES (?)", (uid,))
-                conn.commit()
-                
-            except Exception as e:
-                print(f"Error processing job {uid}: {e}")
+    Sets STOP_EVENT so the monitoring loop exits after the current cycle
+    and the sleep between cycles is interrupted immediately.
+    """
+
+    print("\nShutting down Opportuna...")
+    STOP_EVENT.set()
 
 
 
 if __name__ == "__main__":
     """
     Main execution block - runs the monitoring loop.
-    
+
     The bot runs continuously, checking for new jobs at regular intervals.
     Uses try-catch to handle errors gracefully and continue monitoring.
+    Shutdown is signal-driven: SIGTERM (e.g. from the VM supervisor) and
+    SIGINT (Ctrl+C) both stop the loop cleanly without waiting out the
+    full sleep interval.
     """
 
     print("🐟 Opportuna Started!")
@@ -293,25 +695,29 @@ if __name__ == "__main__":
     print(f"📧 Notifications sent to: {TO_EMAIL}")
     print("=" * 50)
 
+    # Install signal handlers for graceful shutdown
+    signal.signal(signal.SIGTERM, _handle_shutdown)
+    signal.signal(signal.SIGINT, _handle_shutdown)
+
     # Main monitoring loop
-    while True:
+    while not STOP_EVENT.is_set():
         try:
             # Check for new jobs
             check_for_new_jobs()
-            
-        except KeyboardInterrupt:
-            # Graceful shutdown on Ctrl+C
-            print("\nShutting down Opportuna...")
-            break
-            
+
         except Exception as e:
             # Log errors but continue monitoring
             print(f"Error while checking jobs: {e}")
-            
-        # Wait before next check
-        print(f"Sleeping for {CHECK_INTERVAL_MINUTES} minutes...\n")
-        time.sleep(CHECK_INTERVAL_MINUTES * 60)
-    
-    # Close database connection on exit
+
+        # Wait before next check - wakes immediately on shutdown signal
+        if not STOP_EVENT.is_set():
+            print(f"Sleeping for {CHECK_INTERVAL_MINUTES} minutes...\n")
+            STOP_EVENT.wait(CHECK_INTERVAL_MINUTES * 60)
+
+    # Persist the Bloom filter so the next start skips the rebuild scan
+    _save_bloom()
+
+    # Let SQLite refresh its planner statistics, then close the connection
+    cur.execute("PRAGMA optimize")
     conn.close()
     print("Opportuna stopped. Database connection closed.")
\ No newline at end of file